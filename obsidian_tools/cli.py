@@ -7,6 +7,7 @@ from pathlib import Path
 
 from .file_sorter import FileSorter
 from .resource_optimizer import ResourceOptimizer
+from .utils.file_hasher import DEFAULT_HASH_ALGORITHM, HASH_ALGORITHMS
 
 
 def handle_sort_by_year(args: argparse.Namespace) -> None:
@@ -16,7 +17,7 @@ def handle_sort_by_year(args: argparse.Namespace) -> None:
     Args:
         args: Parsed command-line arguments
     """
-    sorter = FileSorter(execute=args.execute)
+    sorter = FileSorter(execute=args.execute, prefer_frontmatter=args.prefer_frontmatter)
     sorter.sort_files(args.path, args.resources)
 
 
@@ -27,7 +28,11 @@ def handle_sort_resources(args: argparse.Namespace) -> None:
     Args:
         args: Parsed command-line arguments
     """
-    optimizer = ResourceOptimizer(base_path=args.path, execute=args.execute)
+    optimizer = ResourceOptimizer(
+        base_path=args.path,
+        execute=args.execute,
+        hash_algorithm=args.hash_algorithm
+    )
     optimizer.optimize_resources()
 
 
@@ -61,6 +66,19 @@ def main():
         action='store_true',
         help='Actually move files (default is dry-run mode)'
     )
+    parser.add_argument(
+        '--prefer-frontmatter',
+        action='store_true',
+        help='Use the frontmatter date even when the filename has a YYYYMMDD_ date (only for sort-by-year mode)'
+    )
+    parser.add_argument(
+        '--hash-algorithm',
+        type=str,
+        choices=list(HASH_ALGORITHMS),
+        default=DEFAULT_HASH_ALGORITHM,
+        help='Hash used to compare resource files (default: blake2b; sha256 for cryptographic strength) '
+             '(only for sort-resources mode)'
+    )
 
     args = parser.parse_args()
 
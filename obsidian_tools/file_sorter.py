@@ -1,24 +1,34 @@
 """Main file sorting orchestration."""
 
+import os
+import stat
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
 from .markdown_parser import MarkdownParser
 from .resource_manager import ResourceManager
+from .utils.directory_cache import DirectoryCache
+from .utils.parallel import MAX_WORKERS
 
 
 class FileSorter:
     """Orchestrates the sorting of markdown files into year-based directories."""
 
-    def __init__(self, execute: bool = False):
+    def __init__(self, execute: bool = False, prefer_frontmatter: bool = False):
         """
         Initialize FileSorter.
 
         Args:
             execute: If True, actually move files. If False, dry-run mode.
+            prefer_frontmatter: If True, the frontmatter date wins over a YYYYMMDD_ filename date.
         """
         self.execute = execute
+        self.prefer_frontmatter = prefer_frontmatter
         self.parser = MarkdownParser()
         self.resource_manager = ResourceManager(execute=execute)
+        self.directories = DirectoryCache()
 
     def sort_files(self, path: Path, resources_path: Path | None = None) -> None:
         """
@@ -28,11 +38,14 @@ class FileSorter:
             path: Directory containing markdown files
             resources_path: Path to _resources directory (optional)
         """
-        if not path.exists():
+        # One stat answers both "exists" and "is a directory"
+        try:
+            path_mode = path.stat().st_mode
+        except OSError:
             print(f"Error: Path '{path}' does not exist")
             return
 
-        if not path.is_dir():
+        if not stat.S_ISDIR(path_mode):
             print(f"Error: Path '{path}' is not a directory")
             return
 
@@ -40,8 +53,14 @@ class FileSorter:
             print(f"Warning: Resources path '{resources_path}' does not exist")
             resources_path = None
 
-        # Find all .md files in the directory (non-recursive)
-        md_files = list(path.glob('*.md'))
+        # Find all .md files in the directory (non-recursive). The listing is
+        # taken up front because files are renamed out of this directory
+        # while processing, which would disturb a live directory iterator.
+        with os.scandir(path) as entries:
+            md_files = [
+                Path(entry.path) for entry in entries
+                if os.path.normcase(entry.name).endswith('.md') and entry.is_file()
+            ]
 
         if not md_files:
             print(f"No markdown files found in {path}")
@@ -51,8 +70,16 @@ class FileSorter:
 
         stats = self._initialize_stats()
 
-        for md_file in md_files:
-            self._process_file(md_file, path, resources_path, stats)
+        # Files are read and parsed on a thread pool; moving stays sequential
+        # so directory creation and conflict handling never race
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            parsed = pool.map(partial(self._parse_file, resources_path=resources_path), md_files)
+            for md_file, (year, resource_links, output) in zip(md_files, parsed):
+                # Each file's report starts with its read errors from the worker
+                # and is written in one go, so reports never interleave
+                self._process_file(md_file, year, resource_links, path, resources_path, stats, output)
+                if output:
+                    sys.stdout.write('\n'.join(output) + '\n')
 
         self._print_summary(stats, resources_path)
 
@@ -76,26 +103,56 @@ class FileSorter:
             'errors': 0
         }
 
+    def _parse_file(
+        self,
+        md_file: Path,
+        resources_path: Path | None
+    ) -> tuple[int | None, list[str], list[str]]:
+        """
+        Read the year and (if needed) resource links of a markdown file.
+
+        Runs on a worker thread, so errors are collected instead of printed.
+
+        Args:
+            md_file: Path to the markdown file
+            resources_path: Path to _resources directory (optional)
+
+        Returns:
+            Tuple of (year, resource_links, output) where output holds the error lines
+        """
+        output: list[str] = []
+
+        # Read the file once when resource links are needed as well
+        if resources_path:
+            year, resource_links = self.parser.parse_file(md_file, self.prefer_frontmatter, output)
+            return (year, resource_links, output)
+
+        return (self.parser.extract_year_from_frontmatter(md_file, self.prefer_frontmatter, output), [], output)
+
     def _process_file(
         self,
         md_file: Path,
+        year: int | None,
+        resource_links: list[str],
         base_path: Path,
         resources_path: Path | None,
-        stats: dict[str, int]
+        stats: dict[str, int],
+        output: list[str]
     ) -> None:
         """
         Process a single markdown file.
 
         Args:
             md_file: Path to the markdown file
+            year: Year parsed from the markdown file, or None if not found
+            resource_links: Resource file references parsed from the markdown file
             base_path: Base directory containing markdown files
             resources_path: Path to _resources directory (optional)
             stats: Statistics dictionary to update
+            output: Buffer collecting the report lines for this file
         """
-        year = self.parser.extract_year_from_frontmatter(md_file)
-
         if year is None:
-            print(f"SKIP (no date): {md_file.name}")
+            output.append(f"SKIP (no date): {md_file.name}")
             stats['skipped_no_date'] += 1
             return
 
@@ -105,17 +162,12 @@ class FileSorter:
 
         # Check if target already exists
         if target_path.exists():
-            print(f"SKIP (exists): {md_file.name} -> {year}/{md_file.name}")
+            output.append(f"SKIP (exists): {md_file.name} -> {year}/{md_file.name}")
             stats['skipped_exists'] += 1
             return
 
-        # Extract resource links
-        resource_links = []
-        if resources_path:
-            resource_links = self.parser.extract_resource_links(md_file)
-
         # Move markdown file
-        if not self._move_markdown_file(md_file, year_dir, target_path, year, stats):
+        if not self._move_markdown_file(md_file, year_dir, target_path, year, stats, output):
             return
 
         # Handle resources
@@ -124,7 +176,7 @@ class FileSorter:
             md_file_for_update = target_path if self.execute else md_file
 
             resource_stats = self.resource_manager.move_resources_for_markdown(
-                md_file_for_update, resource_links, resources_path, year_dir
+                md_file_for_update, resource_links, resources_path, year_dir, output
             )
 
             stats['resources_moved'] += resource_stats['moved']
@@ -138,7 +190,8 @@ class FileSorter:
         year_dir: Path,
         target_path: Path,
         year: int,
-        stats: dict[str, int]
+        stats: dict[str, int],
+        output: list[str]
     ) -> bool:
         """
         Move markdown file to year directory.
@@ -149,21 +202,22 @@ class FileSorter:
             target_path: Target file path
             year: Year number
             stats: Statistics dictionary to update
+            output: Buffer collecting the report lines for this file
 
         Returns:
             True if successful or dry-run, False if error
         """
         action_verb = "MOVED" if self.execute else "WOULD MOVE"
-        print(f"{action_verb}: {md_file.name} -> {year}/{md_file.name}")
+        output.append(f"{action_verb}: {md_file.name} -> {year}/{md_file.name}")
 
         if self.execute:
             try:
-                year_dir.mkdir(exist_ok=True)
+                self.directories.ensure(year_dir)
                 md_file.rename(target_path)
                 stats['moved'] += 1
                 return True
             except OSError as e:
-                print(f"ERROR moving {md_file.name}: {e}")
+                output.append(f"ERROR moving {md_file.name}: {e}")
                 stats['errors'] += 1
                 return False
         else:
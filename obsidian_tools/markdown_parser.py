@@ -1,10 +1,30 @@
 """Markdown file parsing and date extraction."""
 
 import re
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
 
+# Bytes read from the start of a file when only the frontmatter is needed
+_FRONTMATTER_READ_SIZE = 4096
+
+# YAML frontmatter block (between --- delimiters). The date patterns only
+# look at ASCII, so they run on the raw bytes and need no decoding.
+_FRONTMATTER_RE = re.compile(rb'^---\s*\n(.*?)\n---', re.DOTALL)
+# 'Created at' field inside the frontmatter
+_CREATED_AT_RE = re.compile(rb'^Created at:\s*(\d{4})-\d{2}-\d{2}', re.MULTILINE)
+# Embedded files: ![[filename]] or ![[path/filename]], up to | or ]
+_RESOURCE_LINK_RE = re.compile(r'!\[\[([^\]|]+)')
+
+
+@lru_cache(maxsize=256)
+def _resource_links_pattern(old_names: frozenset[str]) -> re.Pattern[str]:
+    """Compile (and cache) one pattern matching ![[_resources/<any of old_names>...]]."""
+    names = '|'.join(map(re.escape, sorted(old_names)))
+    return re.compile(r'(!\[\[_resources/)(' + names + r')(\|[^\]]+\]\]|\]\])')
+
+
 class MarkdownParser:
     """Handles parsing markdown files and extracting metadata."""
 
@@ -22,13 +42,16 @@ class MarkdownParser:
         filename = file_path.name
 
         # Match YYYYMMDD_ pattern at the start of filename
-        match = re.match(r'^(\d{4})(\d{2})(\d{2})_', filename)
-        if not match:
+        if len(filename) < 9 or filename[8] != '_':
+            return None
+
+        digits = filename[:8]
+        if not (digits.isascii() and digits.isdigit()):
             return None
 
-        year = int(match.group(1))
-        month = int(match.group(2))
-        day = int(match.group(3))
+        year = int(digits[:4])
+        month = int(digits[4:6])
+        day = int(digits[6:8])
 
         # Basic validation: year should be reasonable (1900-2100), month 1-12, day 1-31
         if 1900 <= year <= 2100 and 1 <= month <= 12 and 1 <= day <= 31:
@@ -37,64 +60,168 @@ class MarkdownParser:
         return None
 
     @staticmethod
-    def extract_year_from_frontmatter(file_path: Path) -> int | None:
+    def extract_year_from_frontmatter(
+        file_path: Path,
+        prefer_frontmatter: bool = False,
+        output: list[str] | None = None
+    ) -> int | None:
         """
         Extract the year from the 'Created at' field in YAML frontmatter,
         with fallback to filename date pattern.
 
+        By default a YYYYMMDD_ filename prefix is checked first, and the
+        file is only opened when the name carries no date.
+
         Args:
             file_path: Path to the markdown file
+            prefer_frontmatter: If True, let the frontmatter date win over the filename date
+            output: Buffer to collect error lines in; printed directly if None
 
         Returns:
             Year as integer, or None if not found or invalid
         """
-        try:
-            content = file_path.read_text(encoding='utf-8')
+        log = print if output is None else output.append
 
-            # Match YAML frontmatter block (between --- delimiters)
-            frontmatter_match = re.match(r'^---\s*\n(.*?)\n---', content, re.DOTALL)
-            if frontmatter_match:
-                frontmatter = frontmatter_match.group(1)
+        if not prefer_frontmatter:
+            year = MarkdownParser.extract_year_from_filename(file_path)
+            if year is not None:
+                return year
 
-                # Extract 'Created at' field
-                created_match = re.search(r'^Created at:\s*(\d{4})-\d{2}-\d{2}', frontmatter, re.MULTILINE)
-                if created_match:
-                    year = int(created_match.group(1))
-                    return year
+        try:
+            # Frontmatter sits at the top of the file, so only read a prefix
+            with open(file_path, 'rb') as f:
+                content = f.read(_FRONTMATTER_READ_SIZE)
 
-            # Fallback: try to extract year from filename
-            return MarkdownParser.extract_year_from_filename(file_path)
+                # Prefix ends mid-frontmatter: read on only until the closing ---
+                if (len(content) == _FRONTMATTER_READ_SIZE
+                        and content.startswith(b'---')
+                        and not _FRONTMATTER_RE.match(content)):
+                    chunks = [content]
+                    tail = content[-3:]
+                    while chunk := f.read(_FRONTMATTER_READ_SIZE):
+                        chunks.append(chunk)
+                        # Keep the previous tail so a delimiter split across reads is seen
+                        if b'\n---' in tail + chunk:
+                            break
+                        tail = chunk[-3:]
+                    content = b''.join(chunks)
 
-        except (OSError, UnicodeDecodeError) as e:
-            print(f"Error reading {file_path}: {e}")
+        except OSError as e:
+            log(f"Error reading {file_path}: {e}")
             return None
 
+        return MarkdownParser._extract_year_from_content(content, file_path)
+
+    @staticmethod
+    def _extract_year_from_content(content: bytes, file_path: Path) -> int | None:
+        """
+        Extract the year from already-read markdown content,
+        with fallback to filename date pattern.
+
+        Args:
+            content: Raw markdown bytes (at least the frontmatter portion)
+            file_path: Path to the markdown file
+
+        Returns:
+            Year as integer, or None if not found or invalid
+        """
+        # Match YAML frontmatter block (between --- delimiters); notes
+        # without a leading --- never reach the regex
+        frontmatter_match = content.startswith(b'---') and _FRONTMATTER_RE.match(content)
+        if frontmatter_match:
+            frontmatter = frontmatter_match.group(1)
+
+            # Extract 'Created at' field
+            created_match = _CREATED_AT_RE.search(frontmatter)
+            if created_match:
+                year = int(created_match.group(1))
+                return year
+
+        # Fallback: try to extract year from filename
+        return MarkdownParser.extract_year_from_filename(file_path)
+
     @staticmethod
-    def extract_resource_links(file_path: Path) -> list[str]:
+    def extract_resource_links(file_path: Path, output: list[str] | None = None) -> list[str]:
         """
         Extract resource file references from markdown file.
 
         Args:
             file_path: Path to the markdown file
+            output: Buffer to collect error lines in; printed directly if None
 
         Returns:
-            List of resource file references (e.g., ['image.png', '_resources/video.mp4'])
+            List of unique resource file references in order of first appearance
+            (e.g., ['image.png', '_resources/video.mp4'])
         """
+        log = print if output is None else output.append
+
         try:
-            content = file_path.read_text(encoding='utf-8')
+            return MarkdownParser._extract_links_from_content(file_path.read_bytes())
+        except (OSError, UnicodeDecodeError) as e:
+            log(f"Error reading {file_path}: {e}")
+            return []
 
-            # Match all embedded files: ![[filename]] or ![[path/filename]]
-            # Captures the full path/filename before | or ]
-            # Only matches embedded files (with !), not wiki links
-            pattern = r'!\[\[([^\]|]+)'
-            matches = re.findall(pattern, content)
+    @staticmethod
+    def _extract_links_from_content(data: bytes) -> list[str]:
+        """
+        Extract resource file references from already-read markdown content.
 
-            return matches
+        Args:
+            data: Raw markdown bytes
 
-        except (OSError, UnicodeDecodeError) as e:
-            print(f"Error reading {file_path}: {e}")
+        Returns:
+            List of unique resource file references
+
+        Raises:
+            UnicodeDecodeError: If the content embeds files but is not valid UTF-8
+        """
+        # Cheap substring scan first: most notes embed nothing at all,
+        # and those never need to be decoded
+        if b'![[' not in data:
             return []
 
+        # Decoded strictly: links in a note that cannot be decoded could not
+        # be rewritten either, so its resources must not be moved
+        content = data.decode('utf-8')
+
+        # Match all embedded files: ![[filename]] or ![[path/filename]]
+        # Captures the full path/filename before | or ]
+        # Only matches embedded files (with !), not wiki links
+        # A resource embedded several times is reported once, keeping first-seen order
+        return list(dict.fromkeys(_RESOURCE_LINK_RE.findall(content)))
+
+    @staticmethod
+    def parse_file(
+        file_path: Path,
+        prefer_frontmatter: bool = False,
+        output: list[str] | None = None
+    ) -> tuple[int | None, list[str]]:
+        """
+        Extract both the year and the resource links with a single file read.
+
+        Args:
+            file_path: Path to the markdown file
+            prefer_frontmatter: If True, let the frontmatter date win over the filename date
+            output: Buffer to collect error lines in; printed directly if None
+
+        Returns:
+            Tuple of (year, resource_links); year is None if not found or invalid
+        """
+        log = print if output is None else output.append
+
+        try:
+            data = file_path.read_bytes()
+            resource_links = MarkdownParser._extract_links_from_content(data)
+        except (OSError, UnicodeDecodeError) as e:
+            log(f"Error reading {file_path}: {e}")
+            return (None, [])
+
+        year = None if prefer_frontmatter else MarkdownParser.extract_year_from_filename(file_path)
+        if year is None:
+            year = MarkdownParser._extract_year_from_content(data, file_path)
+
+        return (year, resource_links)
+
     @staticmethod
     def update_resource_link(md_file: Path, old_name: str, new_name: str) -> bool:
         """
@@ -108,17 +235,36 @@ class MarkdownParser:
         Returns:
             True if successful, False otherwise
         """
+        return MarkdownParser.batch_update_resource_links(md_file, {old_name: new_name})
+
+    @staticmethod
+    def batch_update_resource_links(md_file: Path, rename_map: dict[str, str]) -> bool:
+        """
+        Update several resource links in the markdown file with a single read and write.
+
+        Args:
+            md_file: Path to the markdown file
+            rename_map: Mapping of original resource filename to new filename
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not rename_map:
+            return True
+
         try:
-            content = md_file.read_text(encoding='utf-8')
+            # Raw bytes in and out: one strict decode, and line endings
+            # are written back exactly as they were read
+            content = md_file.read_bytes().decode('utf-8')
 
-            # Replace the resource reference
-            # Match the pattern ![[_resources/old_name...]] and replace just the filename
-            old_pattern = re.escape(old_name)
-            pattern = r'(!\[\[_resources/)' + old_pattern + r'(\|[^\]]+\]\]|\]\])'
-            replacement = r'\1' + new_name + r'\2'
+            # Match ![[_resources/<any old name>...]] in one pass and
+            # swap in the new name for whichever one matched
+            pattern = _resource_links_pattern(frozenset(rename_map))
 
-            new_content = re.sub(pattern, replacement, content)
-            md_file.write_text(new_content, encoding='utf-8')
+            new_content = pattern.sub(
+                lambda m: m.group(1) + rename_map[m.group(2)] + m.group(3), content
+            )
+            md_file.write_bytes(new_content.encode('utf-8'))
 
             return True
 
@@ -1,15 +1,28 @@
 """Resource usage analysis and conflict detection."""
 
-from dataclasses import dataclass
+import os
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from collections import defaultdict
 
 from .markdown_parser import MarkdownParser
 from .resource_locator import ResourceLocator
-from .utils.file_hasher import FileHasher
+from .utils.file_hasher import DEFAULT_HASH_ALGORITHM, FileHasher
+from .utils.file_walker import FileWalker
+from .utils.hash_cache import HashCache
+from .utils.parallel import MAX_WORKERS
 
 
-@dataclass
+# Below this many resource files a thread pool costs more than it saves
+_PARALLEL_HASH_MIN_FILES = 8
+
+# Directories that never hold notes: vault settings and resource folders
+_MARKDOWN_SKIP_DIRS = frozenset({'.obsidian', '_resources'})
+
+
+@dataclass(slots=True, frozen=True)
 class ResourceReference:
     """Represents a reference to a resource file from a markdown file."""
     md_file_path: Path
@@ -18,137 +31,307 @@ class ResourceReference:
     resource_hash: str | None
 
 
+@dataclass(slots=True)
+class ResourceReferences:
+    """
+    Column-oriented collection of resource references.
+
+    Each field of ResourceReference is kept in its own list, all indexed
+    by the same reference number, so the grouping passes can loop over
+    plain lists instead of reading attributes off one object per reference.
+    """
+    md_file_paths: list[Path] = field(default_factory=list)
+    resource_names: list[str] = field(default_factory=list)
+    resource_actual_paths: list[Path | None] = field(default_factory=list)
+    resource_hashes: list[str | None] = field(default_factory=list)
+
+    def append(self, ref: ResourceReference) -> None:
+        """Add a reference as a new row."""
+        self.md_file_paths.append(ref.md_file_path)
+        self.resource_names.append(ref.resource_name)
+        self.resource_actual_paths.append(ref.resource_actual_path)
+        self.resource_hashes.append(ref.resource_hash)
+
+    def __len__(self) -> int:
+        return len(self.resource_names)
+
+    def __getitem__(self, index: int) -> ResourceReference:
+        return ResourceReference(
+            md_file_path=self.md_file_paths[index],
+            resource_name=self.resource_names[index],
+            resource_actual_path=self.resource_actual_paths[index],
+            resource_hash=self.resource_hashes[index]
+        )
+
+    def __iter__(self) -> Iterator[ResourceReference]:
+        for index in range(len(self)):
+            yield self[index]
+
+
 class ResourceAnalyzer:
     """Analyzes resource usage across markdown files."""
 
-    def __init__(self, base_path: Path):
+    def __init__(
+        self,
+        base_path: Path,
+        hash_cache: HashCache | None = None,
+        hash_algorithm: str = DEFAULT_HASH_ALGORITHM
+    ):
         """
         Initialize ResourceAnalyzer.
 
         Args:
             base_path: Base directory containing markdown files and resources
+            hash_cache: Persistent hash cache shared with the caller (optional)
+            hash_algorithm: Hash algorithm used to compare resource files
         """
         self.base_path = base_path
         self.parser = MarkdownParser()
         self.locator = ResourceLocator()
         self.hasher = FileHasher()
+        self.hash_cache = hash_cache
+        self.hash_algorithm = hash_algorithm
 
-    def build_reference_array(self) -> list[ResourceReference]:
+    def build_reference_array(self) -> ResourceReferences:
         """
         Build array of all resource references from all markdown files.
 
         Returns:
-            List of ResourceReference objects
+            ResourceReferences holding one row per reference
         """
-        references = []
+        references = ResourceReferences()
+        for ref in self.iter_references():
+            references.append(ref)
+        return references
+
+    def iter_references(self) -> Iterator[ResourceReference]:
+        """
+        Yield resource references for all markdown files.
+
+        Markdown files are read on a thread pool and their links resolved
+        first; every distinct resource file is then hashed exactly once,
+        also on a thread pool. Nothing is yielded until that full scan and
+        hashing pass is done; references then come out in walk order, with
+        warnings printed per file so output never interleaves.
+
+        Returns:
+            Iterator over ResourceReference objects
+        """
+        print("Scanning markdown files for resource references...")
+
+        # Build the filename index up front rather than racing to build it in the workers
+        self.locator.get_index(self.base_path)
+
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            resolved = list(pool.map(self._resolve_links, self._iter_markdown_files()))
+
+        hashes = self._hash_resources({
+            path for _, links, _ in resolved for _, found_paths in links for path in found_paths
+        })
+
+        for md_file, links, errors in resolved:
+            references, warnings = self._build_references(md_file, links, hashes)
+            for line in errors + warnings:
+                print(line)
+            yield from references
+
+        print(f"Scanned {len(resolved)} markdown file(s)")
+
+    def _resolve_links(self, md_file: Path) -> tuple[Path, list[tuple[str, list[Path]]], list[str]]:
+        """
+        Extract the resource links of a markdown file and locate each resource.
+
+        Runs on a worker thread, so read errors are collected instead of printed.
+
+        Args:
+            md_file: Path to the markdown file
+
+        Returns:
+            Tuple of (md_file, [(resource_name, found_paths), ...], errors)
+        """
+        links = []
+        errors: list[str] = []
+
+        # Extract resource links from markdown
+        for resource_link in self.parser.extract_resource_links(md_file, errors):
+            # Extract just the filename from the _resources/filename path
+            resource_name = Path(resource_link).name
+
+            # Find the resource in the filesystem
+            links.append((resource_name, self.locator.find_resource(resource_name, self.base_path)))
+
+        return (md_file, links, errors)
 
-        # Find all markdown files recursively
-        md_files = list(self.base_path.rglob('*.md'))
-        print(f"Scanning {len(md_files)} markdown file(s) for resource references...")
+    def _hash_resources(self, paths: set[Path]) -> dict[Path, str | None]:
+        """
+        Hash each resource file once, on a thread pool unless there are only a few.
+
+        Errors are printed after all hashing is done, in path order.
 
-        for md_file in md_files:
-            # Extract resource links from markdown
-            resource_links = self.parser.extract_resource_links(md_file)
+        Args:
+            paths: Resource files to hash
 
-            for resource_link in resource_links:
-                # Extract just the filename from the _resources/filename path
-                resource_name = Path(resource_link).name
+        Returns:
+            Dictionary mapping resource path to its hash (None if unreadable)
+        """
+        paths = sorted(paths)
 
-                # Find the resource in the filesystem
-                found_paths = self.locator.find_resource(resource_name, self.base_path)
+        if len(paths) < _PARALLEL_HASH_MIN_FILES:
+            results = [self._hash_one(path) for path in paths]
+        else:
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+                results = list(pool.map(self._hash_one, paths))
+
+        hashes = {}
+        for path, (digest, errors) in zip(paths, results):
+            for error in errors:
+                print(error)
+            hashes[path] = digest
+
+        return hashes
+
+    def _hash_one(self, path: Path) -> tuple[str | None, list[str]]:
+        """
+        Hash a single resource file, collecting errors instead of printing them.
+
+        Args:
+            path: Resource file to hash
+
+        Returns:
+            Tuple of (hash or None if unreadable, error lines)
+        """
+        errors: list[str] = []
+        digest = self.hasher.compute_hash(path, self.hash_algorithm, self.hash_cache, errors)
+        return (digest, errors)
+
+    def _build_references(
+        self,
+        md_file: Path,
+        links: list[tuple[str, list[Path]]],
+        hashes: dict[Path, str | None]
+    ) -> tuple[list[ResourceReference], list[str]]:
+        """
+        Turn the resolved links of a single markdown file into references.
+
+        Args:
+            md_file: Path to the markdown file
+            links: Resolved links as returned by _resolve_links
+            hashes: Precomputed hashes of all found resource files
 
-                if not found_paths:
-                    # Resource not found
+        Returns:
+            Tuple of (references, warnings) where warnings are the lines to print
+        """
+        references = []
+        warnings = []
+
+        for resource_name, found_paths in links:
+            if not found_paths:
+                # Resource not found
+                references.append(ResourceReference(
+                    md_file_path=md_file,
+                    resource_name=resource_name,
+                    resource_actual_path=None,
+                    resource_hash=None
+                ))
+                warnings.append(f"  WARN: Resource not found: {resource_name} (referenced in {md_file.name})")
+            elif len(found_paths) == 1:
+                # Single instance found
+                resource_path = found_paths[0]
+                references.append(ResourceReference(
+                    md_file_path=md_file,
+                    resource_name=resource_name,
+                    resource_actual_path=resource_path,
+                    resource_hash=hashes[resource_path]
+                ))
+            else:
+                # Multiple instances found - compare hashes to see if they're identical
+                path_hashes = [hashes[p] for p in found_paths]
+                unique_hashes = set(h for h in path_hashes if h is not None)
+
+                if len(unique_hashes) == 1:
+                    # All instances are identical, use the first one
+                    resource_path = found_paths[0]
                     references.append(ResourceReference(
                         md_file_path=md_file,
                         resource_name=resource_name,
-                        resource_actual_path=None,
-                        resource_hash=None
+                        resource_actual_path=resource_path,
+                        resource_hash=path_hashes[0]
                     ))
-                    print(f"  WARN: Resource not found: {resource_name} (referenced in {md_file.name})")
-                elif len(found_paths) == 1:
-                    # Single instance found
-                    resource_path = found_paths[0]
-                    resource_hash = self.hasher.compute_hash(resource_path)
+                else:
+                    # Different files with same name - warning
+                    warnings.append(f"  WARN: Multiple different files found for {resource_name}:")
+                    for path, hash_val in zip(found_paths, path_hashes):
+                        warnings.append(f"    - {path} (hash: {hash_val[:8] if hash_val else 'N/A'}...)")
+                    # Still add reference but mark as conflict
                     references.append(ResourceReference(
                         md_file_path=md_file,
                         resource_name=resource_name,
-                        resource_actual_path=resource_path,
-                        resource_hash=resource_hash
+                        resource_actual_path=found_paths[0],  # Use first found
+                        resource_hash='CONFLICT'
                     ))
-                else:
-                    # Multiple instances found - compute hashes to see if they're identical
-                    hashes = [self.hasher.compute_hash(p) for p in found_paths]
-                    unique_hashes = set(h for h in hashes if h is not None)
-
-                    if len(unique_hashes) == 1:
-                        # All instances are identical, use the first one
-                        resource_path = found_paths[0]
-                        references.append(ResourceReference(
-                            md_file_path=md_file,
-                            resource_name=resource_name,
-                            resource_actual_path=resource_path,
-                            resource_hash=hashes[0]
-                        ))
-                    else:
-                        # Different files with same name - warning
-                        print(f"  WARN: Multiple different files found for {resource_name}:")
-                        for path, hash_val in zip(found_paths, hashes):
-                            print(f"    - {path} (hash: {hash_val[:8] if hash_val else 'N/A'}...)")
-                        # Still add reference but mark as conflict
-                        references.append(ResourceReference(
-                            md_file_path=md_file,
-                            resource_name=resource_name,
-                            resource_actual_path=found_paths[0],  # Use first found
-                            resource_hash='CONFLICT'
-                        ))
 
-        return references
+        return (references, warnings)
+
+    def _iter_markdown_files(self) -> Iterator[Path]:
+        """
+        Walk the base directory once, yielding markdown files as they are found.
+
+        Vault settings and _resources folders are pruned without being listed.
 
-    def detect_conflicts(self, references: list[ResourceReference]) -> dict[str, list[ResourceReference]]:
+        Returns:
+            Iterator over markdown file paths
+        """
+        for entry in FileWalker.iter_files(self.base_path, skip_dirs=_MARKDOWN_SKIP_DIRS):
+            if os.path.normcase(entry.name).endswith('.md'):
+                yield Path(entry.path)
+
+    def detect_conflicts(self, references: ResourceReferences) -> dict[str, list[ResourceReference]]:
         """
         Detect resources with same filename but different hashes.
 
         Args:
-            references: List of ResourceReference objects
+            references: ResourceReferences to check
 
         Returns:
             Dictionary mapping resource name to list of conflicting references
         """
         conflicts = defaultdict(list)
+        hashes = references.resource_hashes
 
-        # Group by resource name
+        # Group reference numbers by resource name
         by_name = defaultdict(list)
-        for ref in references:
-            if ref.resource_hash and ref.resource_hash != 'CONFLICT':
-                by_name[ref.resource_name].append(ref)
+        for index, (resource_name, resource_hash) in enumerate(zip(references.resource_names, hashes)):
+            if resource_hash and resource_hash != 'CONFLICT':
+                by_name[resource_name].append(index)
 
-        # Check for different hashes
-        for resource_name, refs in by_name.items():
-            unique_hashes = set(ref.resource_hash for ref in refs if ref.resource_hash)
-            if len(unique_hashes) > 1:
-                conflicts[resource_name] = refs
+        # Check for different hashes, stopping at the first one that differs
+        for resource_name, indices in by_name.items():
+            first_hash = hashes[indices[0]]
+            if any(hashes[index] != first_hash for index in indices):
+                conflicts[resource_name] = [references[index] for index in indices]
 
         return dict(conflicts)
 
-    def group_by_resource(self, references: list[ResourceReference]) -> dict[Path, list[Path]]:
+    def group_by_resource(self, references: ResourceReferences) -> dict[Path, list[Path]]:
         """
         Group references by unique resource file (path + hash).
 
         Args:
-            references: List of ResourceReference objects
+            references: ResourceReferences to group
 
         Returns:
             Dictionary mapping resource path to list of markdown files that reference it
         """
         grouped = defaultdict(list)
 
-        for ref in references:
+        for md_file_path, resource_path, resource_hash in zip(
+            references.md_file_paths, references.resource_actual_paths, references.resource_hashes
+        ):
             # Skip missing resources and conflicts
-            if ref.resource_actual_path is None or ref.resource_hash == 'CONFLICT':
+            if resource_path is None or resource_hash == 'CONFLICT':
                 continue
 
-            grouped[ref.resource_actual_path].append(ref.md_file_path)
+            grouped[resource_path].append(md_file_path)
 
         return dict(grouped)
 
@@ -168,20 +351,15 @@ class ResourceAnalyzer:
         if len(paths) == 1:
             return paths[0].parent
 
-        # Get all parent directories for each path
-        all_parents = []
-        for path in paths:
-            parents = list(path.parents)
-            all_parents.append(parents)
-
-        # Find common ancestors
-        common_ancestors = set(all_parents[0])
-        for parents in all_parents[1:]:
-            common_ancestors &= set(parents)
+        # Common prefix of the parent directories' parts, in one pass
+        common = []
+        for elems in zip(*(path.parent.parts for path in paths)):
+            first = elems[0]
+            if any(elem != first for elem in elems):
+                break
+            common.append(first)
 
-        if not common_ancestors:
+        if not common:
             return self.base_path
 
-        # Find the deepest (longest path) common ancestor
-        deepest = max(common_ancestors, key=lambda p: len(p.parts))
-        return deepest
+        return Path(*common)
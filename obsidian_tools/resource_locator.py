@@ -1,16 +1,68 @@
 """Resource file location utilities."""
 
+import os
+from collections import defaultdict
 from pathlib import Path
 
+from .utils.file_walker import FileWalker
+
+
+# Vault settings and plugin files are never treated as embeddable resources
+_INDEX_SKIP_DIRS = frozenset({'.obsidian'})
+
 
 class ResourceLocator:
     """Handles locating resource files in the filesystem."""
 
+    def __init__(self):
+        """Initialize ResourceLocator with an empty filename index cache."""
+        self._indexes: dict[Path, dict[str, list[Path]]] = {}
+
     @staticmethod
-    def find_resource(resource_name: str, search_root: Path) -> list[Path]:
+    def build_index(search_root: Path) -> dict[str, list[Path]]:
+        """
+        Walk the directory tree once and index every file by its name.
+
+        Args:
+            search_root: Root directory to index
+
+        Returns:
+            Dictionary mapping (case-normalized) filename to all paths with that name
+        """
+        index = defaultdict(list)
+
+        def report(error: OSError) -> None:
+            print(f"Warning: Error searching {error.filename}: {error}")
+
+        for entry in FileWalker.iter_files(search_root, onerror=report, skip_dirs=_INDEX_SKIP_DIRS):
+            index[os.path.normcase(entry.name)].append(Path(entry.path))
+
+        return dict(index)
+
+    def get_index(self, search_root: Path) -> dict[str, list[Path]]:
+        """
+        Return the filename index for search_root, building it on first use.
+
+        Args:
+            search_root: Root directory to index
+
+        Returns:
+            Dictionary mapping (case-normalized) filename to all paths with that name
+        """
+        index = self._indexes.get(search_root)
+        if index is None:
+            index = self.build_index(search_root)
+            self._indexes[search_root] = index
+
+        return index
+
+    def find_resource(self, resource_name: str, search_root: Path) -> list[Path]:
         """
         Find all instances of a resource file in the directory tree.
 
+        The tree under search_root is walked once on first use; later
+        lookups are answered from the cached index.
+
         Args:
             resource_name: Name of the resource file to find
             search_root: Root directory to search from
@@ -18,20 +70,10 @@ class ResourceLocator:
         Returns:
             List of Path objects pointing to all found instances of the resource
         """
-        found_resources = []
+        index = self.get_index(search_root)
+        return list(index.get(os.path.normcase(resource_name), []))
 
-        try:
-            # Use rglob to recursively search for files matching the name
-            for path in search_root.rglob(resource_name):
-                if path.is_file():
-                    found_resources.append(path)
-        except (OSError, PermissionError) as e:
-            print(f"Warning: Error searching for {resource_name}: {e}")
-
-        return found_resources
-
-    @staticmethod
-    def find_all_resources(resource_names: list[str], search_root: Path) -> dict[str, list[Path]]:
+    def find_all_resources(self, resource_names: list[str], search_root: Path) -> dict[str, list[Path]]:
         """
         Find all instances of multiple resource files in the directory tree.
 
@@ -45,6 +87,6 @@ class ResourceLocator:
         results = {}
 
         for resource_name in resource_names:
-            results[resource_name] = ResourceLocator.find_resource(resource_name, search_root)
+            results[resource_name] = self.find_resource(resource_name, search_root)
 
         return results
@@ -1,8 +1,12 @@
 """Resource file management and moving operations."""
 
+import errno
+import os
+import shutil
 from pathlib import Path
 from typing import Literal
 
+from .utils.directory_cache import DirectoryCache
 from .utils.file_hasher import FileHasher
 from .markdown_parser import MarkdownParser
 
@@ -22,6 +26,17 @@ class ResourceManager:
         """
         self.execute = execute
         self.file_hasher = FileHasher()
+        self.directories = DirectoryCache()
+
+    @staticmethod
+    def _move_file(source: Path, target: Path) -> None:
+        """Rename a file, falling back to copy-and-delete across filesystems."""
+        try:
+            source.rename(target)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(source, target)
 
     @staticmethod
     def get_unique_filename(target_path: Path) -> Path:
@@ -34,18 +49,31 @@ class ResourceManager:
         Returns:
             A unique path that doesn't exist yet
         """
-        if not target_path.exists():
+        parent = target_path.parent
+
+        # List the directory once and probe candidate names against that set
+        try:
+            with os.scandir(parent) as entries:
+                existing = {os.path.normcase(entry.name) for entry in entries}
+        except OSError:
+            # Missing or unreadable directory: fall back to probing with exists()
+            existing = set()
+
+        # normcase is a no-op on POSIX, so on case-insensitive mounts a name
+        # missing from the listing may still exist; exists() has the final word
+        if os.path.normcase(target_path.name) not in existing and not target_path.exists():
             return target_path
 
         stem = target_path.stem
         suffix = target_path.suffix
-        parent = target_path.parent
         counter = 1
 
         while True:
-            new_path = parent / f"{stem}_{counter}{suffix}"
-            if not new_path.exists():
-                return new_path
+            candidate_name = f"{stem}_{counter}{suffix}"
+            if os.path.normcase(candidate_name) not in existing:
+                candidate = parent / candidate_name
+                if not candidate.exists():
+                    return candidate
             counter += 1
 
     def move_resource_file(
@@ -53,16 +81,19 @@ class ResourceManager:
         source_resource: Path,
         target_resource: Path,
         md_file: Path,
-        resource_name: str
+        output: list[str] | None = None
     ) -> tuple[bool, str | None, ResourceMoveStatus]:
         """
         Move a resource file, handling conflicts intelligently.
 
+        Links in the markdown file are not touched here; callers apply the
+        returned new_filename to the markdown file themselves.
+
         Args:
             source_resource: Source path of the resource file
             target_resource: Target path for the resource file
-            md_file: Path to the markdown file (for updating links if needed)
-            resource_name: Original resource filename (for updating links)
+            md_file: Path to the markdown file (for reporting)
+            output: Buffer to collect report lines in; printed directly if None
 
         Returns:
             Tuple of (success, new_filename, status) where:
@@ -70,15 +101,28 @@ class ResourceManager:
             - new_filename: Set if file was renamed, None otherwise
             - status: 'moved', 'renamed', 'missing', 'identical', 'error'
         """
-        if not source_resource.exists():
-            print(f"  WARN: Resource not found: {source_resource.name}")
+        log = print if output is None else output.append
+
+        # One stat per file doubles as the existence check and the size comparison;
+        # any OSError counts as missing, as it did with exists()
+        try:
+            source_size = source_resource.stat().st_size
+        except OSError:
+            log(f"  WARN: Resource not found: {source_resource.name}")
             return (True, None, 'missing')  # Continue anyway
 
-        if target_resource.exists():
-            # Compare file hashes
-            if self.file_hasher.files_are_identical(source_resource, target_resource):
+        try:
+            target_size = target_resource.stat().st_size
+        except OSError:
+            target_size = None
+
+        if target_size is not None:
+            # Compare file contents; files of different size are never read
+            if (source_size == target_size
+                    and self.file_hasher.files_are_identical(
+                        source_resource, target_resource, size=source_size, output=output)):
                 # Same file, can skip
-                print(f"  RESOURCE (identical): {source_resource.name}")
+                log(f"  RESOURCE (identical): {source_resource.name}")
                 return (True, None, 'identical')
             else:
                 # Different files, need to rename
@@ -87,31 +131,29 @@ class ResourceManager:
 
                 if self.execute:
                     try:
-                        source_resource.rename(unique_target)
-                        # Update the markdown file to reference the new name
-                        MarkdownParser.update_resource_link(md_file, resource_name, new_filename)
-                        print(f"  RESOURCE (renamed): {source_resource.name} -> {new_filename}")
+                        self._move_file(source_resource, unique_target)
+                        log(f"  RESOURCE (renamed): {source_resource.name} -> {new_filename}")
                         return (True, new_filename, 'renamed')
                     except OSError as e:
-                        print(f"  ERROR moving resource {source_resource.name}: {e}")
+                        log(f"  ERROR moving resource {source_resource.name}: {e}")
                         return (False, None, 'error')
                 else:
-                    print(f"  WOULD RENAME RESOURCE: {source_resource.name} -> {new_filename}")
-                    print(f"  WOULD UPDATE: {md_file.name} to reference {new_filename}")
+                    log(f"  WOULD RENAME RESOURCE: {source_resource.name} -> {new_filename}")
+                    log(f"  WOULD UPDATE: {md_file.name} to reference {new_filename}")
                     return (True, new_filename, 'renamed')
         else:
             # No conflict, just move
             if self.execute:
                 try:
-                    target_resource.parent.mkdir(parents=True, exist_ok=True)
-                    source_resource.rename(target_resource)
-                    print(f"  RESOURCE: {source_resource.name}")
+                    self.directories.ensure(target_resource.parent)
+                    self._move_file(source_resource, target_resource)
+                    log(f"  RESOURCE: {source_resource.name}")
                     return (True, None, 'moved')
                 except OSError as e:
-                    print(f"  ERROR moving resource {source_resource.name}: {e}")
+                    log(f"  ERROR moving resource {source_resource.name}: {e}")
                     return (False, None, 'error')
             else:
-                print(f"  WOULD MOVE RESOURCE: {source_resource.name}")
+                log(f"  WOULD MOVE RESOURCE: {source_resource.name}")
                 return (True, None, 'moved')
 
     def move_resources_for_markdown(
@@ -119,7 +161,8 @@ class ResourceManager:
         md_file: Path,
         resource_links: list[str],
         resources_path: Path,
-        year_dir: Path
+        year_dir: Path,
+        output: list[str] | None = None
     ) -> dict[str, int]:
         """
         Move all resources associated with a markdown file.
@@ -129,6 +172,7 @@ class ResourceManager:
             resource_links: List of resource file references
             resources_path: Path to the source _resources directory
             year_dir: Target year directory
+            output: Buffer to collect report lines in; printed directly if None
 
         Returns:
             Dictionary with statistics: moved, renamed, missing, errors
@@ -144,15 +188,24 @@ class ResourceManager:
             return stats
 
         year_resources_dir = year_dir / "_resources"
+        # Renamed resources, applied to the markdown file in one pass at the end
+        rename_map: dict[str, str] = {}
+
+        # Filenames already handled; '_resources/a.png' and 'a.png' are the same resource
+        handled: set[str] = set()
 
         for resource_link in resource_links:
             # Extract just the filename from the _resources/filename path
             resource_filename = Path(resource_link).name
+            if resource_filename in handled:
+                continue
+            handled.add(resource_filename)
+
             source_resource = resources_path / resource_filename
             target_resource = year_resources_dir / resource_filename
 
             success, new_filename, status = self.move_resource_file(
-                source_resource, target_resource, md_file, resource_filename
+                source_resource, target_resource, md_file, output
             )
 
             if success:
@@ -160,10 +213,16 @@ class ResourceManager:
                     stats['moved'] += 1
                 elif status == 'renamed':
                     stats['renamed'] += 1
+                    rename_map[resource_filename] = new_filename
                 elif status == 'missing':
                     stats['missing'] += 1
                 # 'identical' doesn't increment any counter
             else:
                 stats['errors'] += 1
 
+        # Update the markdown file to reference the new names
+        if self.execute and rename_map:
+            if not MarkdownParser.batch_update_resource_links(md_file, rename_map):
+                stats['errors'] += 1
+
         return stats
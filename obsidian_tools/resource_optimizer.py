@@ -1,26 +1,40 @@
 """Resource optimization and relocation."""
 
 import re
+import sys
+from collections import defaultdict
 from pathlib import Path
 
 from .resource_analyzer import ResourceAnalyzer
 from .markdown_parser import MarkdownParser
+from .utils.directory_cache import DirectoryCache
+from .utils.file_hasher import DEFAULT_HASH_ALGORITHM
+from .utils.hash_cache import HASH_CACHE_FILENAME, HashCache
+
+
+# Any embed like ![[name]], ![[_resources/name|alias]] or ![[../../_resources/name]];
+# groups: opening brackets, bare resource name, alias/closing brackets
+_EMBED_LINK_RE = re.compile(r'(!\[\[)(?:[^\]|]*?/)?([^\]|/]+)(\|[^\]]+\]|\]\])')
 
 
 class ResourceOptimizer:
     """Handles moving resources to optimal locations."""
 
-    def __init__(self, base_path: Path, execute: bool = False):
+    def __init__(self, base_path: Path, execute: bool = False, hash_algorithm: str = DEFAULT_HASH_ALGORITHM):
         """
         Initialize ResourceOptimizer.
 
         Args:
             base_path: Base directory containing markdown files and resources
             execute: If True, actually move files. If False, dry-run mode.
+            hash_algorithm: Hash algorithm used to compare resource files
         """
         self.base_path = base_path
         self.execute = execute
-        self.analyzer = ResourceAnalyzer(base_path)
+        # Hashes survive between runs so unchanged resources are not re-read
+        self.hash_cache = HashCache(base_path / HASH_CACHE_FILENAME)
+        self.analyzer = ResourceAnalyzer(base_path, hash_cache=self.hash_cache, hash_algorithm=hash_algorithm)
+        self.directories = DirectoryCache()
 
     def optimize_resources(self) -> None:
         """
@@ -35,25 +49,30 @@ class ResourceOptimizer:
         # Phase 1: Build reference array
         print("Phase 1: Building resource reference array...")
         references = self.analyzer.build_reference_array()
+        # A dry run only reads the cache and leaves the vault untouched
+        if self.execute:
+            self.hash_cache.save()
         print(f"Found {len(references)} resource reference(s)")
         print()
 
         # Phase 2: Detect conflicts
-        print("Phase 2: Detecting conflicts...")
+        # Report lines of each phase are collected and written in one go
+        output = ["Phase 2: Detecting conflicts..."]
         conflicts = self.analyzer.detect_conflicts(references)
         if conflicts:
-            print(f"WARNING: Found {len(conflicts)} resource(s) with same name but different content:")
+            output.append(f"WARNING: Found {len(conflicts)} resource(s) with same name but different content:")
             for resource_name, refs in conflicts.items():
-                print(f"  - {resource_name}:")
+                output.append(f"  - {resource_name}:")
                 for ref in refs:
-                    print(f"    Referenced in: {ref.md_file_path}")
-                    print(f"    Found at: {ref.resource_actual_path}")
-                    print(f"    Hash: {ref.resource_hash[:8] if ref.resource_hash else 'N/A'}...")
-            print("  These resources will NOT be moved to avoid conflicts.")
-            print()
+                    output.append(f"    Referenced in: {ref.md_file_path}")
+                    output.append(f"    Found at: {ref.resource_actual_path}")
+                    output.append(f"    Hash: {ref.resource_hash[:8] if ref.resource_hash else 'N/A'}...")
+            output.append("  These resources will NOT be moved to avoid conflicts.")
+            output.append("")
+        self._write_output(output)
 
         # Phase 3: Group by resource and calculate optimal locations
-        print("Phase 3: Calculating optimal locations...")
+        output = ["Phase 3: Calculating optimal locations..."]
         grouped = self.analyzer.group_by_resource(references)
 
         # Filter out conflicts
@@ -78,113 +97,149 @@ class ResourceOptimizer:
                 continue
 
             # Calculate optimal location
+            resource_name = resource_path.name
             ancestor = self.analyzer.find_lowest_common_ancestor(md_files)
-            optimal_location = ancestor / "_resources" / resource_path.name
+            optimal_location = ancestor / "_resources" / resource_name
+            relative_source = resource_path.relative_to(self.base_path)
 
             # Check if already in optimal location
             if resource_path == optimal_location:
-                print(f"SKIP (already optimal): {resource_path.name}")
-                print(f"  Location: {resource_path.relative_to(self.base_path)}")
+                output.append(f"SKIP (already optimal): {resource_name}")
+                output.append(f"  Location: {relative_source}")
                 stats['skipped_optimal'] += 1
                 continue
 
             moves.append((resource_path, optimal_location, md_files))
-            print(f"{'WILL MOVE' if not self.execute else 'MOVING'}: {resource_path.name}")
-            print(f"  From: {resource_path.relative_to(self.base_path)}")
-            print(f"  To: {optimal_location.relative_to(self.base_path)}")
-            print(f"  Referenced by {len(md_files)} markdown file(s)")
+            output.append(f"{'WILL MOVE' if not self.execute else 'MOVING'}: {resource_name}")
+            output.append(f"  From: {relative_source}")
+            output.append(f"  To: {optimal_location.relative_to(self.base_path)}")
+            output.append(f"  Referenced by {len(md_files)} markdown file(s)")
 
-        print()
+        output.append("")
+        self._write_output(output)
 
         # Phase 4: Move resources
         if moves:
-            print(f"Phase 4: {'Moving' if self.execute else 'Would move'} resources...")
+            output = [f"Phase 4: {'Moving' if self.execute else 'Would move'} resources..."]
+            # New resource locations per markdown file, so each file is rewritten once
+            link_updates: dict[Path, dict[str, Path]] = defaultdict(dict)
             for resource_path, optimal_location, md_files in moves:
-                success = self._move_resource(resource_path, optimal_location, md_files)
+                success = self._move_resource(resource_path, optimal_location, md_files, output)
                 if success:
                     stats['moved'] += 1
+                    for md_file in md_files:
+                        link_updates[md_file][resource_path.name] = optimal_location
                 else:
                     stats['errors'] += 1
-            print()
+
+            if self.execute:
+                for md_file, new_locations in link_updates.items():
+                    if not self._update_markdown_links(md_file, new_locations, output):
+                        stats['errors'] += 1
+            output.append("")
+            self._write_output(output)
 
         # Print summary
         self._print_summary(stats)
 
-    def _move_resource(self, source: Path, target: Path, md_files: list[Path]) -> bool:
+    @staticmethod
+    def _write_output(output: list[str]) -> None:
+        """Write collected report lines to stdout with a single call."""
+        sys.stdout.write('\n'.join(output) + '\n')
+
+    def _move_resource(
+        self,
+        source: Path,
+        target: Path,
+        md_files: list[Path],
+        output: list[str] | None = None
+    ) -> bool:
         """
-        Move a resource and update all referencing markdown files.
+        Move a resource to its optimal location.
+
+        The links in md_files are rewritten afterwards by the caller, once
+        per markdown file for all resources moved in this run.
 
         Args:
             source: Current path of the resource
             target: Target path for the resource
             md_files: List of markdown files that reference this resource
+            output: Buffer to collect report lines in; printed directly if None
 
         Returns:
             True if successful, False otherwise
         """
+        log = print if output is None else output.append
         resource_name = source.name
 
         if self.execute:
             try:
                 # Create target directory
-                target.parent.mkdir(parents=True, exist_ok=True)
+                self.directories.ensure(target.parent)
 
                 # Move the resource
                 source.rename(target)
 
-                # Update all markdown files
-                for md_file in md_files:
-                    self._update_markdown_link(md_file, resource_name, target)
-
                 return True
 
             except OSError as e:
-                print(f"  ERROR: Failed to move {resource_name}: {e}")
+                log(f"  ERROR: Failed to move {resource_name}: {e}")
                 return False
         else:
             # Dry-run mode
-            print(f"  WOULD UPDATE {len(md_files)} markdown file(s)")
+            log(f"  WOULD UPDATE {len(md_files)} markdown file(s)")
             return True
 
-    def _update_markdown_link(self, md_file: Path, resource_name: str, new_resource_path: Path) -> bool:
+    def _update_markdown_links(
+        self,
+        md_file: Path,
+        new_locations: dict[str, Path],
+        output: list[str] | None = None
+    ) -> bool:
         """
-        Update resource link in markdown file to reflect new location.
+        Update all moved resource links in a markdown file in a single rewrite.
 
         Args:
             md_file: Path to the markdown file
-            resource_name: Name of the resource
-            new_resource_path: New absolute path to the resource
+            new_locations: Dictionary mapping resource name to its new absolute path
+            output: Buffer to collect report lines in; printed directly if None
 
         Returns:
             True if successful, False otherwise
         """
+        log = print if output is None else output.append
+
         try:
             content = md_file.read_text(encoding='utf-8')
 
-            # Calculate relative path from markdown file to resource
+            # Calculate relative path from markdown file to each resource
             md_dir = md_file.parent
-            try:
-                relative_path = new_resource_path.relative_to(md_dir)
-            except ValueError:
-                # If not in same tree, use the path relative to a common ancestor
-                relative_path = Path("_resources") / resource_name
-
-            # Convert to forward slashes for markdown
-            relative_str = str(relative_path).replace('\\', '/')
-
-            # Update the resource reference
-            # Match patterns like ![[_resources/filename]] or ![[../../_resources/filename]]
-            old_pattern = re.escape(resource_name)
-            pattern = r'(!\[\[)(?:.*?/)?' + old_pattern + r'(\|[^\]]+\]|\]\])'
-            replacement = r'\1' + relative_str + r'\2'
-
-            new_content = re.sub(pattern, replacement, content)
-            md_file.write_text(new_content, encoding='utf-8')
+            relative_strs = {}
+            for resource_name, new_resource_path in new_locations.items():
+                try:
+                    relative_path = new_resource_path.relative_to(md_dir)
+                except ValueError:
+                    # If not in same tree, use the path relative to a common ancestor
+                    relative_path = Path("_resources") / resource_name
+
+                # Convert to forward slashes for markdown
+                relative_strs[resource_name] = relative_path.as_posix()
+
+            def replace(match: re.Match[str]) -> str:
+                relative_str = relative_strs.get(match.group(2))
+                if relative_str is None:
+                    return match.group(0)
+                return match.group(1) + relative_str + match.group(3)
+
+            # Update the resource references
+            new_content = _EMBED_LINK_RE.sub(replace, content)
+            if new_content != content:
+                md_file.write_text(new_content, encoding='utf-8')
 
             return True
 
         except (OSError, UnicodeDecodeError) as e:
-            print(f"  ERROR: Failed to update {md_file.name}: {e}")
+            log(f"  ERROR: Failed to update {md_file.name}: {e}")
             return False
 
     def _print_summary(self, stats: dict[str, int]) -> None:
@@ -0,0 +1,22 @@
+"""Directory creation with repeat mkdir calls skipped."""
+
+from pathlib import Path
+
+
+class DirectoryCache:
+    """Remembers directories already created so each one is made only once."""
+
+    def __init__(self):
+        """Initialize DirectoryCache with no directories created yet."""
+        self._created: set[Path] = set()
+
+    def ensure(self, directory: Path) -> None:
+        """
+        Create a directory (and its parents) unless it was already created.
+
+        Args:
+            directory: Directory that must exist
+        """
+        if directory not in self._created:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._created.add(directory)
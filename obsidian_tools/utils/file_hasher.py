@@ -1,50 +1,143 @@
 """File hashing utilities for comparing files."""
 
 import hashlib
+import os
+from functools import lru_cache, partial
 from pathlib import Path
 
+from .hash_cache import HashCache
+
+
+# Algorithms offered on the command line; BLAKE2b is used unless
+# cryptographic collision resistance is explicitly asked for
+HASH_ALGORITHMS = ("blake2b", "sha256")
+DEFAULT_HASH_ALGORITHM = "blake2b"
+
+# Read size for hashing; large reads keep syscall count low on media files
+_HASH_CHUNK_SIZE = 1 << 20
+
+# Direct constructors skip hashlib.new()'s lookup by name;
+# a 128-bit BLAKE2b digest is plenty for telling files apart
+_HASH_CONSTRUCTORS = {
+    "blake2b": partial(hashlib.blake2b, digest_size=16),
+    "sha256": hashlib.sha256,
+}
+
+
+@lru_cache(maxsize=4096)
+def _compute_hash_cached(path_str: str, size: int, mtime_ns: int, algorithm: str) -> str:
+    """
+    Hash a file's contents, memoized on its path, size and modification time.
+
+    Size and mtime are part of the cache key only so that a modified file
+    misses the cache. Read errors propagate and are therefore not cached.
+    """
+    constructor = _HASH_CONSTRUCTORS.get(algorithm)
+    hash_obj = constructor() if constructor is not None else hashlib.new(algorithm)
+    # One buffer per call, no larger than the file, filled in place by readinto
+    buf = bytearray(min(max(size, 1), _HASH_CHUNK_SIZE))
+    view = memoryview(buf)
+    with open(path_str, "rb", buffering=0) as f:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        while n := f.readinto(buf):
+            hash_obj.update(view[:n])
+    return hash_obj.hexdigest()
+
 
 class FileHasher:
     """Handles file hashing operations for duplicate detection."""
 
     @staticmethod
-    def compute_hash(file_path: Path, algorithm: str = "sha256") -> str | None:
+    def compute_hash(
+        file_path: Path,
+        algorithm: str = DEFAULT_HASH_ALGORITHM,
+        cache: HashCache | None = None,
+        output: list[str] | None = None
+    ) -> str | None:
         """
         Compute hash of a file.
 
+        Hashes are only compared for equality, so a fast non-cryptographic
+        use of BLAKE2b (128-bit digest) is the default rather than SHA-256.
+
         Args:
             file_path: Path to the file
-            algorithm: Hash algorithm to use (default: sha256)
+            algorithm: Hash algorithm to use (default: blake2b)
+            cache: Persistent hash cache to consult and fill (optional)
+            output: Buffer to collect error lines in; printed directly if None
 
         Returns:
             Hex string of the hash, or None if file cannot be read
         """
+        log = print if output is None else output.append
+
         try:
-            hash_obj = hashlib.new(algorithm)
-            with open(file_path, "rb") as f:
-                for byte_block in iter(lambda: f.read(4096), b""):
-                    hash_obj.update(byte_block)
-            return hash_obj.hexdigest()
+            st = os.stat(file_path)
+
+            if cache is not None:
+                digest = cache.get(st, algorithm)
+                if digest is not None:
+                    return digest
+
+            digest = _compute_hash_cached(os.fspath(file_path), st.st_size, st.st_mtime_ns, algorithm)
+
+            if cache is not None:
+                cache.put(st, algorithm, digest)
+
+            return digest
         except OSError as e:
-            print(f"Error hashing {file_path}: {e}")
+            log(f"Error hashing {file_path}: {e}")
             return None
 
     @staticmethod
-    def files_are_identical(file1: Path, file2: Path) -> bool:
+    def files_are_identical(
+        file1: Path,
+        file2: Path,
+        size: int | None = None,
+        output: list[str] | None = None
+    ) -> bool:
         """
-        Check if two files are identical by comparing their hashes.
+        Check if two files are identical by comparing their contents.
+
+        Files of different size are rejected without being read; otherwise
+        both are read side by side and the comparison stops at the first
+        chunk that differs. Hashing is only worth it for N-way comparisons.
 
         Args:
             file1: Path to first file
             file2: Path to second file
+            size: Size both files are already known to have (skips the stat calls)
+            output: Buffer to collect error lines in; printed directly if None
 
         Returns:
             True if files are identical, False otherwise
         """
-        hash1 = FileHasher.compute_hash(file1)
-        hash2 = FileHasher.compute_hash(file2)
+        log = print if output is None else output.append
 
-        if hash1 is None or hash2 is None:
-            return False
+        try:
+            if size is None:
+                size = os.stat(file1).st_size
+                if os.stat(file2).st_size != size:
+                    return False
+
+            chunk_size = min(max(size, 1), _HASH_CHUNK_SIZE)
+            buf1 = bytearray(chunk_size)
+            buf2 = bytearray(chunk_size)
 
-        return hash1 == hash2
+            with open(file1, "rb") as f1, open(file2, "rb") as f2:
+                while True:
+                    n1 = f1.readinto(buf1)
+                    n2 = f2.readinto(buf2)
+                    if n1 != n2:
+                        return False
+                    if n1 == 0:
+                        return True
+                    if n1 == chunk_size:
+                        if buf1 != buf2:
+                            return False
+                    elif buf1[:n1] != buf2[:n2]:
+                        return False
+        except OSError as e:
+            log(f"Error comparing {file1} and {file2}: {e}")
+            return False
@@ -0,0 +1,54 @@
+"""Directory tree walking utilities."""
+
+import os
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+
+class FileWalker:
+    """Handles walking directory trees with as few stat calls as possible."""
+
+    @staticmethod
+    def iter_files(
+        root: Path,
+        onerror: Callable[[OSError], None] | None = None,
+        skip_dirs: frozenset[str] = frozenset()
+    ) -> Iterator[os.DirEntry]:
+        """
+        Yield every regular file below root.
+
+        Uses os.scandir directly: entry types come from the directory
+        listing itself, so only symlinks need an extra stat. Symlinked
+        directories are not followed.
+
+        Args:
+            root: Root directory to walk
+            onerror: Called with the OSError when a directory cannot be listed
+            skip_dirs: Names of subdirectories that are not entered at all
+
+        Returns:
+            Iterator over os.DirEntry objects for the files found
+        """
+        stack = [os.fspath(root)]
+
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    subdirs = []
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in skip_dirs:
+                                    subdirs.append(entry.path)
+                            elif entry.is_file():
+                                yield entry
+                        except OSError:
+                            continue
+            except OSError as e:
+                if onerror is not None:
+                    onerror(e)
+                continue
+
+            # Visit subdirectories in listing order, like os.walk
+            stack.extend(reversed(subdirs))
@@ -0,0 +1,132 @@
+"""Persistent cache of file hashes between runs."""
+
+import json
+import os
+from pathlib import Path
+
+
+HASH_CACHE_FILENAME = ".obsidian-tools-hashcache.json"
+# Bumped whenever the meaning of stored digests changes; older files are ignored
+_CACHE_VERSION = 2
+
+
+class HashCache:
+    """
+    Remembers file hashes keyed by device and inode.
+
+    An entry is only reused while the file's size and modification time
+    are unchanged, so edited files are always hashed again. Files without
+    a real inode number (st_ino of 0) are never cached. Only entries
+    looked up or stored since loading are saved, so files that are gone
+    or no longer referenced drop out of the cache.
+    """
+
+    def __init__(self, cache_file: Path | None = None):
+        """
+        Initialize HashCache, loading earlier entries from cache_file if it exists.
+
+        Args:
+            cache_file: JSON file to load from and save to (None for an in-memory cache)
+        """
+        self.cache_file = cache_file
+        self._entries: dict[str, dict] = {}
+        # Keys looked up or stored during this run; the rest is pruned on save
+        self._seen: set[str] = set()
+        self._dirty = False
+
+        if cache_file is not None:
+            self._load()
+
+    def _load(self) -> None:
+        """Load entries from the cache file, ignoring a missing or unreadable file."""
+        try:
+            data = json.loads(self.cache_file.read_text(encoding='utf-8'))
+            entries = data.get('entries', {})
+            if data.get('version') == _CACHE_VERSION and isinstance(entries, dict):
+                # Drop malformed entries so get() only ever sees well-formed ones
+                self._entries = {
+                    key: entry for key, entry in entries.items()
+                    if self._is_valid_entry(entry)
+                }
+        except (OSError, ValueError, AttributeError):
+            self._entries = {}
+
+    @staticmethod
+    def _is_valid_entry(entry: object) -> bool:
+        """Check that a loaded entry has the fields and types put() writes."""
+        return (isinstance(entry, dict)
+                and type(entry.get('modified_ns')) is int
+                and type(entry.get('size')) is int
+                and isinstance(entry.get('algorithm'), str)
+                and isinstance(entry.get('hash'), str))
+
+    @staticmethod
+    def _key(st: os.stat_result) -> str:
+        # Only meaningful for a nonzero inode; some SMB/FUSE mounts report 0
+        # for every file, and get()/put() bypass the cache for those
+        return f"{st.st_dev}:{st.st_ino}"
+
+    def get(self, st: os.stat_result, algorithm: str) -> str | None:
+        """
+        Look up the hash of a file by its stat result.
+
+        Args:
+            st: Result of os.stat for the file
+            algorithm: Hash algorithm the caller wants
+
+        Returns:
+            Cached hex digest, or None if there is no up-to-date entry
+        """
+        if not st.st_ino:
+            return None
+
+        key = self._key(st)
+        self._seen.add(key)
+        entry = self._entries.get(key)
+        if (entry is None
+                or entry.get('modified_ns') != st.st_mtime_ns
+                or entry.get('size') != st.st_size
+                or entry.get('algorithm') != algorithm):
+            return None
+
+        return entry.get('hash')
+
+    def put(self, st: os.stat_result, algorithm: str, digest: str) -> None:
+        """
+        Store the hash of a file.
+
+        Args:
+            st: Result of os.stat for the file
+            algorithm: Hash algorithm used
+            digest: Hex digest of the file contents
+        """
+        if not st.st_ino:
+            return
+
+        key = self._key(st)
+        self._seen.add(key)
+        self._entries[key] = {
+            'modified_ns': st.st_mtime_ns,
+            'size': st.st_size,
+            'algorithm': algorithm,
+            'hash': digest
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache file if entries were added or pruned since loading."""
+        if self.cache_file is None:
+            return
+
+        entries = {key: entry for key, entry in self._entries.items() if key in self._seen}
+        if not self._dirty and len(entries) == len(self._entries):
+            return
+
+        tmp_file = self.cache_file.with_name(self.cache_file.name + '.tmp')
+        try:
+            tmp_file.write_text(json.dumps({'version': _CACHE_VERSION, 'entries': entries}), encoding='utf-8')
+            os.replace(tmp_file, self.cache_file)
+            self._entries = entries
+            self._dirty = False
+        except OSError as e:
+            print(f"Warning: Could not save hash cache {self.cache_file}: {e}")
@@ -0,0 +1,8 @@
+"""Shared settings for thread-pooled file work."""
+
+import os
+
+
+# Per-file work is mostly I/O (reads, hashing with the GIL released),
+# so use more threads than cores, capped like ThreadPoolExecutor's default
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)